@@ -1,7 +1,8 @@
 import streamlit as st
 import os
+import shutil
 import uuid
-from backend import readData, getCourses, proposeSections, proposeShifts, slotInfo, getCourseSlot, getStudentsInSection
+from backend import readData, getCourses, proposeSectionsFromData, proposeShifts, slotInfoMap, getCourseSlot, getStudentsInSection
 
 UPLOAD_DIR = "uploads"
 SCHEDULE_JSON = "const/FA25_blocks.json"
@@ -16,6 +17,11 @@ if "show_json_upload" not in st.session_state:
 def load_data(excel_path, schedule_path):
     return readData(excel_path, schedule_path)
 
+@st.cache_data(show_spinner=False)
+def propose_sections_cached(excel_path, schedule_path, course, min_students):
+    df_courses, schedule = load_data(excel_path, schedule_path)
+    return proposeSectionsFromData(df_courses, schedule, course, min_students)
+
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 st.title("Course Splitter")
@@ -30,7 +36,7 @@ uploaded_file = st.file_uploader("Upload registration excel file", type=["xlsx"]
 if uploaded_file:
     temp_excel_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.xlsx")
     with open(temp_excel_path, "wb") as f:
-        f.write(uploaded_file.getvalue())
+        shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
     
     st.session_state["excel_path"] = temp_excel_path
     st.success("File uploaded successfully!")
@@ -46,7 +52,7 @@ if uploaded_file:
         if json_upload:
             temp_json_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.json")
             with open(temp_json_path, "wb") as f:
-                f.write(json_upload.getvalue())
+                shutil.copyfileobj(json_upload, f, length=1024 * 1024)
             st.session_state["schedule_path"] = temp_json_path
             st.session_state["show_json_upload"] = False
             st.success("Custom schedule uploaded successfully!")
@@ -73,20 +79,22 @@ if "excel_path" in st.session_state and os.path.exists(st.session_state["schedul
 
                 st.subheader("Course Info")
                 current_slot = getCourseSlot(df_courses, schedule, selected_course)
-                current_num_students = len(getStudentsInSection(df_courses, selected_course))
+                original_students = getStudentsInSection(df_courses, selected_course)
+                current_num_students = len(original_students)
                 st.write(f"**Selected course:** {selected_course}")
                 st.write(f"**Slot:** {current_slot}")
                 st.write(f"**Number of students:** {current_num_students}")
 
                 ## AVAILABLE SLOTS
                 
-                suggested_slots = proposeSections(st.session_state["excel_path"], st.session_state["schedule_path"], selected_course, min_students)
+                suggested_slots = propose_sections_cached(st.session_state["excel_path"], st.session_state["schedule_path"], selected_course, min_students)
                 if suggested_slots:
                     st.subheader("Available Slots")
 
+                    slot_info_map = slotInfoMap(schedule)
                     slot_data = [
                         {
-                            "Slot": f"Block {slot} ({slotInfo(slot, st.session_state['schedule_path'])[0]} {slotInfo(slot, st.session_state['schedule_path'])[1]})",
+                            "Slot": f"Block {slot} ({slot_info_map[slot][0]} {slot_info_map[slot][1]})",
                             "Available Students": len(students)
                         }
 
@@ -102,10 +110,10 @@ if "excel_path" in st.session_state and os.path.exists(st.session_state["schedul
                         if students_to_shift:
                             st.subheader(f"Slot {selected_slot}'s proposed shifts")
                             
-                            original_students = getStudentsInSection(df_courses, selected_course)
-                            original_slot = getCourseSlot(df_courses, schedule, selected_course)
-                            
-                            remaining_students = [student for student in original_students if student not in students_to_shift]
+                            original_slot = current_slot
+
+                            shift_set = set(students_to_shift)
+                            remaining_students = [student for student in original_students if student not in shift_set]
 
                             st.write(f"**Remaining students in slot {original_slot} ({len(remaining_students)}):** {', '.join(remaining_students)}")
                             st.write(f"**Students to shift to new slot {selected_slot} ({len(students_to_shift)}):** {', '.join(students_to_shift)}")
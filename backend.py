@@ -1,16 +1,33 @@
 import json
+import os
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, time
 from typing import Dict, List, Any
-from collections import defaultdict
+from functools import lru_cache
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
+DAY_COLUMNS = ['M', 'T', 'W', 'R', 'F']
+DAY_BITS = {'Monday': 1, 'Tuesday': 2, 'Wednesday': 4, 'Thursday': 8, 'Friday': 16}
+REQUIRED_COLUMNS = ['id', 'crs_cde', 'M', 'T', 'W', 'R', 'F', 'begin_time', 'end_time']
+
+
+@lru_cache(maxsize=4096)
 def parseTime(time_str: str) -> datetime.time:
     """
     Returns a time object given a string HH:MM:SS or HH:MM
     """
     if not isinstance(time_str, str):
         raise ValueError("Error parsing time: Input must be a string in HH:MM:SS or HH:MM format.")
+    if len(time_str) == 5 and time_str[2] == ':':
+        try:
+            return time(int(time_str[:2]), int(time_str[3:5]))
+        except ValueError:
+            pass
     try:
         return datetime.strptime(time_str, '%H:%M:%S').time()
     except ValueError:
@@ -20,86 +37,279 @@ def parseTime(time_str: str) -> datetime.time:
             raise ValueError("Error parsing time: Input must be a string in HH:MM:SS or HH:MM format.")
         
 
-def courseOverlapSlot(course_row: pd.Series, slot: Dict[str, Any]) -> bool:
-    """
-    Checks if a course overlaps with a given time slot.
-    """
-    course_days = []
-    if course_row.get('M', '').strip():
-        course_days.append('Monday')
-    if course_row.get('T', '').strip():
-        course_days.append('Tuesday')
-    if course_row.get('W', '').strip():
-        course_days.append('Wednesday')
-    if course_row.get('R', '').strip():
-        course_days.append('Thursday')
-    if course_row.get('F', '').strip():
-        course_days.append('Friday')
-        
-    slot_days = slot['days']
-    if not set(course_days).intersection(slot_days):
-        return False
-    
+@lru_cache(maxsize=4096)
+def parseMinutes(time_str: str) -> int:
+    """
+    Returns minutes since midnight for a HH:MM:SS or HH:MM string, or -1
+    if it cannot be parsed.
+    """
+    if not isinstance(time_str, str):
+        return -1
+    parts = time_str.split(':')
+    if len(parts) not in (2, 3):
+        return -1
     try:
-        course_start = parseTime(course_row['begin_time'])
-        course_end = parseTime(course_row['end_time'])
-        slot_start = parseTime(slot['start_time'])
-        slot_end = parseTime(slot['end_time'])
-    except Exception as e:
-        raise ValueError(f"Error parsing time: {e}")
+        hour, minute = int(parts[0]), int(parts[1])
+    except ValueError:
+        return -1
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return -1
+    return hour * 60 + minute
 
-    if not all([course_start, course_end, slot_start, slot_end]):
-        return False
 
-    return course_start <= slot_end and course_end >= slot_start
+def addOverlapColumns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the integer-minute and day-bitmask columns used by the vectorized overlap.
+    """
+    for source, target in (('begin_time', '_begin_min'), ('end_time', '_end_min')):
+        if source in df.columns:
+            values = df[source].astype(str)
+            parsed = pd.to_datetime(values, format='%H:%M:%S', errors='coerce', cache=True)
+            missing = parsed.isna()
+            if missing.any():
+                parsed = parsed.fillna(pd.to_datetime(values[missing], format='%H:%M', errors='coerce', cache=True))
+            minutes = parsed.dt.hour * 60 + parsed.dt.minute
+            df[target] = minutes.fillna(-1).astype(np.int16)
+        else:
+            df[target] = np.int16(-1)
+
+    days_mask = np.zeros(len(df), dtype=np.uint8)
+    for bit, column in enumerate(DAY_COLUMNS):
+        if column in df.columns:
+            flagged = df[column]
+            if not pd.api.types.is_bool_dtype(flagged):
+                flagged = flagged.astype(str).str.strip().str.len() > 0
+            days_mask |= flagged.to_numpy(dtype=np.uint8) << bit
+    df['_days_mask'] = days_mask
+    return df
+
+
+def compileBlocks(schedule: Dict[str, Any]) -> tuple:
+    """
+    Returns (slot_ids, slot_begin, slot_end, slot_mask) NumPy arrays for the
+    schedule blocks, cached on the schedule dict after the first call.
+    """
+    if '_compiled' not in schedule:
+        blocks = schedule['blocks']
+        slot_ids = np.array([block['slot'] for block in blocks])
+        slot_begin = np.array([parseMinutes(block['start_time']) for block in blocks], dtype=np.int16)
+        slot_end = np.array([parseMinutes(block['end_time']) for block in blocks], dtype=np.int16)
+        slot_mask = np.array(
+            [sum(DAY_BITS[day] for day in block['days']) for block in blocks],
+            dtype=np.uint8
+        )
+        schedule['_compiled'] = (slot_ids, slot_begin, slot_end, slot_mask)
+    return schedule['_compiled']
+
+
+def slotInfoMap(schedule: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Returns a mapping of slot id to its [days, time] display info, cached
+    on the schedule dict after the first call.
+    """
+    if '_slot_info' not in schedule:
+        schedule['_slot_info'] = {
+            block['slot']: [
+                ''.join(day[0] if day != "Thursday" else "R" for day in block['days']),
+                f"{block['start_time']}-{block['end_time']}"
+            ]
+            for block in schedule['blocks']
+        }
+    return schedule['_slot_info']
+
+
+@lru_cache(maxsize=4)
+def loadSchedule(json_file: str) -> Dict[str, Any]:
+    """
+    Loads a schedule JSON file and precomputes its slot arrays and info map.
+
+    Results are cached per path, so repeated calls (e.g. slotInfo inside a
+    rendering loop) reuse the parsed schedule instead of re-reading the file.
+    """
+    try:
+        with open(json_file, 'r') as file:
+            schedule = json.load(file)
+    except FileNotFoundError:
+        raise ValueError(f"Error: {json_file} not found.")
+    except json.JSONDecodeError:
+        raise ValueError(f"Error: {json_file} is not a valid JSON file.")
+
+    compileBlocks(schedule)
+    slotInfoMap(schedule)
+    return schedule
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _overlapKernel(course_begin, course_end, course_mask, slot_begin, slot_end, slot_mask):
+        out = np.zeros((course_begin.shape[0], slot_begin.shape[0]), dtype=np.bool_)
+        for i in prange(course_begin.shape[0]):
+            begin = course_begin[i]
+            end = course_end[i]
+            mask = course_mask[i]
+            if begin < 0 or end < 0:
+                continue
+            for j in range(slot_begin.shape[0]):
+                out[i, j] = (mask & slot_mask[j]) != 0 and begin <= slot_end[j] and end >= slot_begin[j]
+        return out
+else:
+    _overlapKernel = None
+
+
+def overlapMatrix(courses_df: pd.DataFrame, schedule: Dict[str, Any]) -> np.ndarray:
+    """
+    Returns a (courses x slots) boolean matrix marking course/slot overlaps.
+
+    Uses the Numba kernel when numba is installed, otherwise falls back to
+    NumPy broadcasting.
+    """
+    _, slot_begin, slot_end, slot_mask = compileBlocks(schedule)
+    course_begin = courses_df['_begin_min'].to_numpy()
+    course_end = courses_df['_end_min'].to_numpy()
+    course_mask = courses_df['_days_mask'].to_numpy()
+
+    if _overlapKernel is not None:
+        return _overlapKernel(course_begin, course_end, course_mask, slot_begin, slot_end, slot_mask)
+
+    valid = (course_begin >= 0) & (course_end >= 0)
+    return (
+        (course_begin[:, None] <= slot_end[None, :])
+        & (course_end[:, None] >= slot_begin[None, :])
+        & ((course_mask[:, None] & slot_mask[None, :]) != 0)
+        & valid[:, None]
+    )
+
+
+def _getBusySlotsSet(courses_df: pd.DataFrame, schedule: Dict[str, List[Dict[str, Any]]]) -> set:
+    """
+    Returns the set of busy slots for a given student's courses.
+    """
+    slot_ids = compileBlocks(schedule)[0]
+    overlap = overlapMatrix(courses_df, schedule)
+    return set(slot_ids[overlap.any(axis=0)].tolist())
 
 
 def getBusySlots(courses_df: pd.DataFrame, schedule: Dict[str, List[Dict[str, Any]]]) -> List[str]:
     """
-    Returns a list of busy slots for a given student's courses.
+    Returns a sorted list of busy slots for a given student's courses.
     """
-    busy_slots = set()
-    for _, course in courses_df.iterrows():
-        if course.get('begin_time') and course.get('end_time'):
-            for slot in schedule['blocks']:
-                if courseOverlapSlot(course, slot):
-                    busy_slots.add(slot['slot'])
-    return sorted(list(busy_slots))
+    return sorted(_getBusySlotsSet(courses_df, schedule))
+
+
+def computeAllBusySlots(df_courses: pd.DataFrame, schedule: Dict[str, Any]) -> Dict[str, frozenset]:
+    """
+    Returns a dict mapping every student id to a frozenset of busy slots.
+
+    The result is cached on the DataFrame, so proposals for different
+    target courses against the same data reuse a single overlap pass.
+    """
+    cached = df_courses.attrs.get('_busy_by_student')
+    if cached is not None and cached[0] is schedule:
+        return cached[1]
+
+    slot_ids = compileBlocks(schedule)[0]
+    overlap = overlapMatrix(df_courses, schedule)
+    busy_by_student = {
+        student_id: frozenset(slot_ids[overlap[row_positions].any(axis=0)].tolist())
+        for student_id, row_positions in df_courses.groupby('id').indices.items()
+    }
+    df_courses.attrs['_busy_by_student'] = (schedule, busy_by_student)
+    return busy_by_student
 
 
 def getAllSlots(schedule: Dict[str, List[Dict[str, Any]]]) -> List[str]:
     """
     Returns a sorted list of all slots in the schedule.
     """
-    return sorted([slot['slot'] for slot in schedule['blocks']])
+    if '_all_slots' not in schedule:
+        schedule['_all_slots'] = sorted(compileBlocks(schedule)[0].tolist())
+    return schedule['_all_slots']
 
 def getCourseSlot(df_courses: pd.DataFrame, schedule: Dict[str, Any], target_course_code: str) -> str:
     """
     Returns the slot for the given course code.
     """
-    course_rows = df_courses[df_courses['crs_cde'] == target_course_code]
-    if course_rows.empty:
-        raise ValueError(f"No rows found for course '{target_course_code}'")
-    
-    course_row = course_rows.iloc[0]
-    for block in schedule['blocks']:
-        if courseOverlapSlot(course_row, block):
-            return block['slot']
-    
+    course_repr = df_courses.attrs.get('course_repr')
+    if course_repr is not None and target_course_code in course_repr.index:
+        course_row = course_repr.loc[target_course_code]
+    else:
+        course_rows = df_courses[df_courses['crs_cde'] == target_course_code]
+        if course_rows.empty:
+            raise ValueError(f"No rows found for course '{target_course_code}'")
+        course_row = course_rows.iloc[0]
+
+    slot_ids, slot_begin, slot_end, slot_mask = compileBlocks(schedule)
+    course_mask = int(course_row['_days_mask'])
+    course_begin = int(course_row['_begin_min'])
+    course_end = int(course_row['_end_min'])
+
+    if course_mask and course_begin >= 0 and course_end >= 0:
+        for j in range(len(slot_ids)):
+            if course_mask & slot_mask[j] and course_begin <= slot_end[j] and course_end >= slot_begin[j]:
+                return str(slot_ids[j])
+
     raise ValueError(f"No overlapping slot found for course '{target_course_code}'")
 
 
+def _readExcel(file_path: str) -> pd.DataFrame:
+    """
+    Reads an Excel file as strings, preferring the faster calamine engine.
+
+    Only the columns the pipeline consumes are converted; everything else
+    is skipped at parse time.
+    """
+    def usecols(column):
+        return column in REQUIRED_COLUMNS
+
+    try:
+        return pd.read_excel(file_path, dtype=str, usecols=usecols, engine='calamine')
+    except ImportError:
+        return pd.read_excel(file_path, dtype=str, usecols=usecols)
+
+
+def _cleanFrame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalizes a raw registration frame and adds the overlap columns.
+    """
+    kept_columns = [column for column in REQUIRED_COLUMNS if column in df.columns]
+    if kept_columns:
+        df = df[kept_columns].copy()
+
+    for column in df.columns:
+        df[column] = (
+            df[column].fillna('').astype(str)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip()
+        )
+
+    for column in DAY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].str.len() > 0
+
+    return addOverlapColumns(df)
+
+
 def cleanExcel(file_path: str) -> pd.DataFrame:
     """
     Cleans and converts Excel data to a pandas DataFrame.
+
+    The cleaned result is cached next to the source file as Parquet, so
+    repeated runs on the same upload skip the Excel parse entirely.
     """
+    cache_path = file_path + '.parquet'
     try:
-        df = pd.read_excel(file_path, dtype=str)
-        
-        for column in df.columns:
-            df[column] = df[column].apply(
-                lambda x: ' '.join(str(x).split()).strip() if pd.notna(x) else ''
-            )
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            return pd.read_parquet(cache_path)
+    except (ImportError, OSError, ValueError):
+        pass
+
+    try:
+        df = _cleanFrame(_readExcel(file_path))
+
+        try:
+            df.to_parquet(cache_path)
+        except (ImportError, OSError, ValueError):
+            pass
 
         return df
 
@@ -113,36 +323,44 @@ def cleanExcel(file_path: str) -> pd.DataFrame:
 def processSchedule(excel_file: str, json_file: str):
     """
     Processes student schedules and writes busy and available slots to an output CSV.
-    """
-    df = cleanExcel(excel_file)
-    if df.empty:
-        raise ValueError("Error: Data cleaning failed or file was empty.")
 
-    try:
-        with open(json_file, 'r') as file:
-            schedule = json.load(file)
-    except FileNotFoundError:
-        raise ValueError(f"Error: {json_file} not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"Error: {json_file} is not a valid JSON file.")
-    
-    required_columns = ['M', 'T', 'W', 'R', 'F', 'begin_time', 'end_time']
-    for col in required_columns:
-        if col not in df.columns:
-            df[col] = ''
-    
+    CSV inputs are streamed in chunks and folded into a per-student busy
+    mask, so the whole registration file is never resident at once.
+    """
+    schedule = loadSchedule(json_file)
     all_slots = getAllSlots(schedule)
-    
-    grouped = df.groupby('id')
-    
+    slot_ids = compileBlocks(schedule)[0]
+
+    if excel_file.endswith('.csv'):
+        try:
+            reader = pd.read_csv(excel_file, dtype=str, chunksize=100_000)
+        except FileNotFoundError:
+            raise ValueError(f"Error: '{excel_file}' was not found.")
+        frames = (_cleanFrame(chunk) for chunk in reader)
+    else:
+        df = cleanExcel(excel_file)
+        if df.empty:
+            raise ValueError("Error: Data cleaning failed or file was empty.")
+        frames = [df]
+
+    busy_by_student: Dict[str, np.ndarray] = {}
+    for frame in frames:
+        overlap = overlapMatrix(frame, schedule)
+        for student_id, row_positions in frame.groupby('id').indices.items():
+            busy_mask = overlap[row_positions].any(axis=0)
+            if student_id in busy_by_student:
+                busy_by_student[student_id] |= busy_mask
+            else:
+                busy_by_student[student_id] = busy_mask
+
     output_records = []
-    for student_id, courses in grouped:
-        busy_slots = getBusySlots(courses, schedule)
+    for student_id, busy_mask in busy_by_student.items():
+        busy_slots = set(slot_ids[busy_mask].tolist())
         available_slots = [slot for slot in all_slots if slot not in busy_slots]
 
         output_records.append({
             'id': student_id,
-            'busy_slots': '-'.join(busy_slots),
+            'busy_slots': '-'.join(sorted(busy_slots)),
             'available_slots': '-'.join(available_slots)
         })
 
@@ -156,19 +374,8 @@ def slotInfo(slot: str, json_file: str) -> List[Any]:
     """
     Returns the time and days information for a given slot.
     """
-    try:
-        with open(json_file, 'r') as file:
-            schedule = json.load(file)
-    except FileNotFoundError:
-        raise ValueError(f"Error: {json_file} not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"Error: {json_file} is not a valid JSON file.")
-
-    for block in schedule['blocks']:
-        if block['slot'] == slot:
-            days = ''.join([day[0] if day != "Thursday" else "R" for day in block['days']])
-            time = f"{block['start_time']}-{block['end_time']}"
-            return [days, time]
+    schedule = loadSchedule(json_file)
+    return slotInfoMap(schedule).get(slot)
 
 
 def readData(excel_file: str, schedule_json: str) -> pd.DataFrame:
@@ -179,19 +386,21 @@ def readData(excel_file: str, schedule_json: str) -> pd.DataFrame:
     if df_courses.empty:
         raise ValueError("Could not load or clean course data from Excel file.")
     
-    try:
-        with open(schedule_json, 'r') as file:
-            schedule = json.load(file)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"'{schedule_json}' not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"'{schedule_json}' is not a valid JSON.")
-    
+    schedule = loadSchedule(schedule_json)
+
     if 'crs_cde' not in df_courses.columns:
         raise ValueError(f"Error: 'crs_cde' column not found in {excel_file}. Cannot identify target section.")
 
-    df_courses['crs_cde'] = df_courses['crs_cde'].apply(lambda x: ' '.join(str(x).split()).strip() if pd.notna(x) else '')
-    
+    df_courses['crs_cde'] = (
+        df_courses['crs_cde'].fillna('').astype(str)
+        .str.split().str.join(' ')
+    ).astype('category')
+    if 'id' in df_courses.columns:
+        df_courses['id'] = df_courses['id'].astype('category')
+
+    df_courses.attrs['course_repr'] = df_courses.drop_duplicates('crs_cde').set_index('crs_cde')
+    df_courses.attrs['by_crs'] = df_courses.groupby('crs_cde').indices
+
     return df_courses, schedule
 
 
@@ -209,6 +418,13 @@ def getStudentsInSection(df_courses: pd.DataFrame, target_course_code: str) -> p
     """
     Returns a DataFrame of students in the specified course section.
     """
+    by_crs = df_courses.attrs.get('by_crs')
+    if by_crs is not None:
+        row_positions = by_crs.get(target_course_code)
+        if row_positions is None or len(row_positions) == 0:
+            raise ValueError(f"No students found in section '{target_course_code}'. Please check the course code.")
+        return df_courses['id'].iloc[row_positions].unique()
+
     students_in_section = df_courses[df_courses['crs_cde'] == target_course_code]
 
     if students_in_section.empty:
@@ -229,14 +445,11 @@ def getAvailability(df_courses: pd.DataFrame, schedule: Dict[str, Any],
         raise ValueError(f"Error getting students in section '{target_course_code}': {e}")
 
     all_slots = getAllSlots(schedule)
-    
-    student_busy_slots: Dict[str, List[str]] = {}
-    for student_id in original_student_ids:
-        student_courses = df_courses[df_courses['id'] == student_id]
-        student_busy_slots[student_id] = getBusySlots(student_courses, schedule)
+    busy_by_student = computeAllBusySlots(df_courses, schedule)
 
     student_available_slots: Dict[str, List[str]] = {}
-    for student_id, busy_slots in student_busy_slots.items():
+    for student_id in original_student_ids:
+        busy_slots = busy_by_student.get(student_id, frozenset())
         student_available_slots[student_id] = [
             slot for slot in all_slots if slot not in busy_slots
         ]
@@ -244,32 +457,46 @@ def getAvailability(df_courses: pd.DataFrame, schedule: Dict[str, Any],
     return student_available_slots
 
 
-def findNewSection(df_courses: pd.DataFrame, schedule: Dict[str, Any], target_course_code: str) -> List[tuple]:
+def findNewSection(df_courses: pd.DataFrame, schedule: Dict[str, Any], target_course_code: str,
+                   min_students: int = 0) -> List[tuple]:
     """
     Finds common potential section for students based on their availability.
-    """
-    all_slots = getAllSlots(schedule)
 
+    Slots with fewer than min_students available are dropped before sorting,
+    so only surviving candidates are ranked and materialized.
+    """
     try:
-        student_available_slots = getAvailability(df_courses, schedule, target_course_code)
+        original_student_ids = getStudentsInSection(df_courses, target_course_code)
     except Exception as e:
         raise ValueError(f"Error getting student availability: {e}")
 
-    potential_new_sections: Dict[str, List[str]] = defaultdict(list)
-    for student_id, available_slots in student_available_slots.items():
-        for slot in available_slots:
-            if slot:
-                potential_new_sections[slot].append(student_id)
-
-    if not potential_new_sections:
+    slot_list = compileBlocks(schedule)[0].tolist()
+    busy_by_student = computeAllBusySlots(df_courses, schedule)
+    student_ids = np.array(sorted(set(original_student_ids)))
+    available = np.array([
+        [slot not in busy_by_student.get(student_id, frozenset()) for slot in slot_list]
+        for student_id in student_ids
+    ], dtype=bool).reshape(len(student_ids), len(slot_list))
+
+    # Students with a full schedule contribute to no slot; skip them early.
+    has_free_slot = available.any(axis=1)
+    available = available[has_free_slot]
+    student_ids = student_ids[has_free_slot]
+
+    counts = available.sum(axis=0)
+    eligible = np.flatnonzero(counts >= max(min_students, 1))
+    order = eligible[np.argsort(-counts[eligible], kind='stable')]
+
+    sorted_potential_sections = [
+        (slot_list[j], student_ids[available[:, j]].tolist())
+        for j in order
+    ]
+
+    if not sorted_potential_sections:
+        if min_students > 1 and (counts > 0).any():
+            raise ValueError(f"No slots found with at least {min_students} students available.")
         raise ValueError(f"No common free slots found for any students in section '{target_course_code}'.")
 
-    sorted_potential_sections = sorted(
-        potential_new_sections.items(),
-        key=lambda item: len(item[1]),
-        reverse=True
-    )
-
     return sorted_potential_sections
 
 
@@ -282,28 +509,27 @@ def proposeSections(excel_file: str, schedule_json: str, target_course_code: str
     except (FileNotFoundError, ValueError) as e:
         raise ValueError(f"Error reading data: {e}")
 
+    return proposeSectionsFromData(df_courses, schedule, target_course_code, min_students)
+
+
+def proposeSectionsFromData(df_courses: pd.DataFrame, schedule: Dict[str, Any],
+                            target_course_code: str, min_students: int = 5):
+    """
+    Proposes new sections from already-loaded course data and schedule.
+    """
     try:
-        potential_sections = findNewSection(df_courses, schedule, target_course_code)
+        potential_sections = findNewSection(df_courses, schedule, target_course_code, min_students)
     except Exception as e:
         raise ValueError(f"Error finding new section: {e}")
 
-    suggested_slots = dict()
-    for slot, students in potential_sections:
-        if len(students) >= min_students:
-            suggested_slots[slot] = students
-    if not suggested_slots:
-        raise ValueError(f"No slots found with at least {min_students} students available.")
-    return suggested_slots
+    return dict(potential_sections)
 
 
 def proposeShifts(suggested_slots: dict, selected_slot: str):
     """
     Proposes students to shift for a given suggested slot.
     """
-    for slot, students in suggested_slots.items():
-        if slot == selected_slot:
-            return students
-    return []
+    return suggested_slots.get(selected_slot, [])
 
 
 if __name__ == "__main__":